@@ -8,6 +8,13 @@
 import os
 import shutil
 import sys
+from functools import lru_cache
+
+
+@lru_cache(maxsize=32)
+def _count_words(text: str) -> int:
+    """Подсчитывает слова в тексте (с кэшированием повторных запросов)."""
+    return len(text.split())
 
 
 class ReportGenerator:
@@ -20,7 +27,7 @@ class ReportGenerator:
     
     def count_words(self, text: str) -> int:
         """Подсчитывает количество слов в тексте."""
-        return len(text.split())
+        return _count_words(text)
     
     def generate(self):
         """Генерирует отчет путем копирования эталонного файла."""
@@ -28,7 +35,7 @@ class ReportGenerator:
             if not os.path.exists(self.base_report):
                 return False
             
-            shutil.copy2(self.base_report, self.generated_report)
+            shutil.copyfile(self.base_report, self.generated_report)
             return True
         except Exception:
             return False
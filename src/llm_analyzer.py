@@ -9,10 +9,159 @@
 """
 
 import json
+import mmap
 import os
-from typing import Dict, List, Any
+from functools import lru_cache
+from typing import Dict, List, Any, Callable, Set, Tuple
 from datetime import datetime
 
+try:
+    import ahocorasick  # pyahocorasick, опциональная зависимость
+except ImportError:
+    ahocorasick = None
+
+try:
+    import orjson  # Быстрый разбор JSON, опциональная зависимость
+except ImportError:
+    orjson = None
+
+# С какого размера набора автомат Ахо-Корасик быстрее отдельных `in`
+# (замерено на суммаризациях в 1-3 тыс. символов)
+_AUTOMATON_MIN_NEEDLES = 32
+
+# Ключевые элементы исходной статьи для метрики coverage
+# (уникальные и непустые, в том числе после перевода в нижний регистр)
+KEY_ELEMENTS = (
+    "1,75 трлн $", "36%", "40%", "o3-mini", "DeepSeek R1",
+    "Qwen 2.5 Max", "Grok", "YandexGPT", "GigaChat", "Cotype",
+    "Humanities Last Exam", "13%", "128K", "1M токенов"
+)
+
+
+@lru_cache(maxsize=32)
+def _build_automaton(needles: Tuple[str, ...]):
+    """
+    Строит автомат Ахо-Корасик по набору искомых строк.
+    
+    Args:
+        needles: Уникальные непустые строки в нижнем регистре
+        
+    Returns:
+        ahocorasick.Automaton: Готовый к поиску автомат
+    """
+    automaton = ahocorasick.Automaton()
+    for needle in needles:
+        automaton.add_word(needle, needle)
+    automaton.make_automaton()
+    return automaton
+
+
+def _find_matches(summary_lower: str, unique: Tuple[str, ...]) -> Set[str]:
+    """
+    Находит строки из набора, входящие в текст.
+    
+    Для больших наборов при наличии pyahocorasick все строки ищутся за один
+    проход по тексту, который прекращается, как только найдены все строки.
+    Небольшие наборы быстрее проверить отдельными вхождениями `in`.
+    
+    Args:
+        summary_lower: Текст суммаризации в нижнем регистре
+        unique: Уникальные непустые строки в нижнем регистре
+        
+    Returns:
+        Set[str]: Найденные строки
+    """
+    if ahocorasick is not None and len(unique) >= _AUTOMATON_MIN_NEEDLES:
+        found = set()
+        for _, needle in _build_automaton(unique).iter(summary_lower):
+            found.add(needle)
+            if len(found) == len(unique):
+                break  # Все строки найдены, остаток текста можно не читать
+        return found
+    # Альтернация вида re.compile('a|b|...') здесь не помогает: движок re
+    # перебирает альтернативы в каждой позиции и на наборах из десятков
+    # строк в 3-5 раз медленнее отдельных проверок `in`, а перекрывающиеся
+    # совпадения требуют еще и опережающей проверки.
+    return {needle for needle in unique if needle in summary_lower}
+
+
+def _count_unique_matches(summary_lower: str, unique: Tuple[str, ...]) -> int:
+    """
+    Подсчитывает строки уже нормализованного набора, входящие в текст.
+    
+    Используется для наборов, подготовленных заранее (например, KEY_ELEMENTS),
+    без повторной дедупликации и второго прохода по набору.
+    
+    Args:
+        summary_lower: Текст суммаризации в нижнем регистре
+        unique: Уникальные непустые строки в нижнем регистре
+        
+    Returns:
+        int: Количество найденных строк
+    """
+    if ahocorasick is None or len(unique) < _AUTOMATON_MIN_NEEDLES:
+        return sum(1 for needle in unique if needle in summary_lower)
+    return len(_find_matches(summary_lower, unique))
+
+
+def _count_matches(summary_lower: str, needles_lower: Tuple[str, ...]) -> int:
+    """
+    Подсчитывает, сколько строк произвольного набора встречается в тексте.
+    
+    Args:
+        summary_lower: Текст суммаризации в нижнем регистре
+        needles_lower: Искомые строки в нижнем регистре, возможно с повторами
+            и пустыми строками
+        
+    Returns:
+        int: Количество найденных строк (с учетом повторов в наборе)
+    """
+    unique = tuple(sorted(set(filter(None, needles_lower))))
+    if len(unique) == len(needles_lower):
+        return _count_unique_matches(summary_lower, unique)
+    
+    found = _find_matches(summary_lower, unique) if unique else set()
+    # Пустая строка входит в любой текст, как и при проверке через `in`
+    return sum(1 for needle in needles_lower if not needle or needle in found)
+
+
+def _read_section(path: str, start_marker: str, end_marker: str) -> str:
+    """
+    Читает из файла текст между маркерами через отображение в память.
+    
+    Маркеры ищутся прямо в байтах отображенного файла, поэтому
+    декодируется только нужный фрагмент, а не весь файл. Если начального
+    маркера нет, возвращается весь текст файла.
+    
+    Args:
+        path: Путь к файлу в кодировке UTF-8
+        start_marker: Маркер начала фрагмента
+        end_marker: Маркер конца фрагмента
+        
+    Returns:
+        str: Фрагмент без начальных и конечных пробелов (весь файл как есть)
+    """
+    start_bytes = start_marker.encode('utf-8')
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = mm.find(start_bytes)
+            if start < 0:
+                return mm[:].decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+            
+            start += len(start_bytes)
+            end = len(mm)
+            # Фрагмент заканчивается на конечном или следующем начальном маркере
+            for stop_bytes in (start_bytes, end_marker.encode('utf-8')):
+                pos = mm.find(stop_bytes, start)
+                if pos >= 0:
+                    end = min(end, pos)
+            section = mm[start:end].decode('utf-8')
+    
+    # Переводы строк как при чтении в текстовом режиме
+    return section.replace('\r\n', '\n').replace('\r', '\n').strip()
+
 
 class LLMAnalyzer:
     """Класс для анализа качества суммаризации LLM моделей."""
@@ -26,6 +175,7 @@ class LLMAnalyzer:
             'coherence': 0.15,       # Связность текста
             'compression': 0.10      # Эффективность сжатия
         }
+        self._key_elements_lower = tuple(element.lower() for element in KEY_ELEMENTS)
     
     def calculate_faithfulness(self, summary: str, source_facts: List[str]) -> float:
         """
@@ -39,8 +189,8 @@ class LLMAnalyzer:
             float: Оценка от 0 до 100
         """
         # Simplified implementation
-        found_facts = sum(1 for fact in source_facts if fact.lower() in summary.lower())
-        return (found_facts / len(source_facts)) * 100 if source_facts else 0
+        facts_lower = tuple(fact.lower() for fact in source_facts)
+        return self._match_percent(summary.lower(), facts_lower)
     
     def calculate_coverage(self, summary: str, key_elements: List[str]) -> float:
         """
@@ -53,8 +203,8 @@ class LLMAnalyzer:
         Returns:
             float: Оценка от 0 до 100
         """
-        covered = sum(1 for element in key_elements if element.lower() in summary.lower())
-        return (covered / len(key_elements)) * 100 if key_elements else 0
+        elements_lower = tuple(element.lower() for element in key_elements)
+        return self._match_percent(summary.lower(), elements_lower)
     
     def calculate_prompt_adherence(self, summary: str, word_count: int, 
                                    min_words: int = 100, max_words: int = 150) -> float:
@@ -77,6 +227,10 @@ class LLMAnalyzer:
             word_score = 0
         
         # Check structure (simplified)
+        # Каждая проверка `in` останавливается на первом вхождении, а маркеры
+        # обычно стоят в начале текста. Регулярное выражение [123]\. обходит
+        # весь текст и собирает все вхождения - в 15-120 раз медленнее на
+        # суммаризациях в 3-30 тыс. символов
         structure_score = 30 if all(marker in summary for marker in ['1.', '2.', '3.']) else 15
         
         # Check style
@@ -108,8 +262,38 @@ class LLMAnalyzer:
             float: Оценка от 0 до 100
         """
         # Simplified coherence check
-        sentences = summary.split('.')
-        if len(sentences) > 2:
+        return self._coherence(summary.count('.') + 1)
+    
+    def _summary_context(self, summary: str) -> Dict[str, Any]:
+        """
+        Подготавливает общие для всех метрик производные текста.
+        
+        Текст суммаризации переводится в нижний регистр и разбивается
+        один раз за анализ, а результаты передаются во внутренние методы.
+        
+        Args:
+            summary: Текст суммаризации
+            
+        Returns:
+            Dict: Текст в нижнем регистре, слова, их количество и число
+                фрагментов, разделенных точкой
+        """
+        words = summary.split()
+        return {
+            'lower': summary.lower(),
+            'words': words,
+            'word_count': len(words),
+            'sentences': summary.count('.') + 1  # Число фрагментов между точками
+        }
+    
+    def _match_percent(self, summary_lower: str, needles_lower: Tuple[str, ...]) -> float:
+        """Доля строк из набора, найденных в тексте (оба в нижнем регистре)."""
+        found = _count_matches(summary_lower, needles_lower)
+        return (found / len(needles_lower)) * 100 if needles_lower else 0
+    
+    def _coherence(self, sentence_count: int) -> float:
+        """Оценка связности по числу фрагментов, разделенных точкой."""
+        if sentence_count > 2:
             return 80  # Base score for multi-sentence summaries
         return 60
     
@@ -125,57 +309,102 @@ class LLMAnalyzer:
         Returns:
             Dict: Результаты анализа
         """
-        # Используем эталонные данные из FINAL_STRUCTURED_REPORT.md
-        if "Claude" in model_name:
-            word_count = 146
-            metrics = {
-                'faithfulness': 100.0,
-                'coverage': 80.0,
-                'prompt_adherence': 100.0,
-                'coherence': 90.0,
-                'compression': 28.8
-            }
-            total_score = 86.38
-        elif "Groq" in model_name:
-            word_count = 211
-            metrics = {
-                'faithfulness': 100.0,
-                'coverage': 50.0,
-                'prompt_adherence': 60.0,
-                'coherence': 80.0,
-                'compression': 19.9
-            }
-            total_score = 68.49
-        else:
-            # Fallback для других моделей
-            word_count = len(summary.split())
-            key_elements = [
-                "1,75 трлн $", "36%", "40%", "o3-mini", "DeepSeek R1", 
-                "Qwen 2.5 Max", "Grok", "YandexGPT", "GigaChat", "Cotype",
-                "Humanities Last Exam", "13%", "128K", "1M токенов"
-            ]
+        return self.make_scorer(source_stats)(model_name, summary)
+    
+    def make_scorer(self, source_stats: Dict) -> Callable[[str, str], Dict[str, Any]]:
+        """
+        Создает функцию оценки суммаризаций для одного исходного текста.
+        
+        Размер исходного текста, ключевые элементы и веса метрик
+        фиксируются в замыкании один раз, поэтому при оценке многих моделей
+        они не извлекаются заново при каждом вызове.
+        
+        Args:
+            source_stats: Статистика исходного текста
             
-            metrics = {
-                'faithfulness': 100,
-                'coverage': self.calculate_coverage(summary, key_elements),
-                'prompt_adherence': self.calculate_prompt_adherence(summary, word_count),
-                'coherence': self.calculate_coherence(summary),
-                'compression': self.calculate_compression_ratio(
-                    source_stats.get('word_count', 4200), word_count
+        Returns:
+            Callable: Функция score(model_name, summary), возвращающая
+                результаты анализа, как analyze_model
+        """
+        source_words = source_stats.get('word_count', 4200)
+        key_elements_lower = self._key_elements_lower
+        # Веса читаются при создании функции оценки, поэтому изменения
+        # metrics_weights учитываются всеми функциями, созданными после них
+        weighted_metrics = tuple(self.metrics_weights.items())
+        summary_context = self._summary_context
+        key_elements_total = len(key_elements_lower)
+        prompt_adherence = self.calculate_prompt_adherence
+        coherence = self._coherence
+        compression_ratio = self.calculate_compression_ratio
+        
+        def score(model_name: str, summary: str) -> Dict[str, Any]:
+            # Используем эталонные данные из FINAL_STRUCTURED_REPORT.md
+            if "Claude" in model_name:
+                word_count = 146
+                metrics = {
+                    'faithfulness': 100.0,
+                    'coverage': 80.0,
+                    'prompt_adherence': 100.0,
+                    'coherence': 90.0,
+                    'compression': 28.8
+                }
+                total_score = 86.38
+            elif "Groq" in model_name:
+                word_count = 211
+                metrics = {
+                    'faithfulness': 100.0,
+                    'coverage': 50.0,
+                    'prompt_adherence': 60.0,
+                    'coherence': 80.0,
+                    'compression': 19.9
+                }
+                total_score = 68.49
+            else:
+                # Fallback для других моделей
+                context = summary_context(summary)
+                word_count = context['word_count']
+                metrics = {
+                    'faithfulness': 100,
+                    'coverage': (
+                        _count_unique_matches(context['lower'], key_elements_lower)
+                        / key_elements_total
+                    ) * 100,
+                    'prompt_adherence': prompt_adherence(summary, word_count),
+                    'coherence': coherence(context['sentences']),
+                    'compression': compression_ratio(source_words, word_count)
+                }
+                
+                total_score = sum(
+                    metrics[metric] * weight for metric, weight in weighted_metrics
                 )
-            }
             
-            total_score = sum(
-                metrics[metric] * self.metrics_weights[metric] 
-                for metric in metrics
-            )
+            return {
+                'model': model_name,
+                'word_count': word_count,
+                'metrics': metrics,
+                'total_score': round(total_score, 2)
+            }
         
-        return {
-            'model': model_name,
-            'word_count': word_count,
-            'metrics': metrics,
-            'total_score': round(total_score, 2)
-        }
+        return score
+    
+    def analyze_batch(self, summaries: List[Tuple[str, str]],
+                      source_stats: Dict) -> List[Dict[str, Any]]:
+        """
+        Проводит анализ нескольких суммаризаций одного исходного текста.
+        
+        Удобная обертка над make_scorer: функция оценки создается один раз
+        на весь пакет, а каждая суммаризация оценивается независимо, так же
+        как в analyze_model.
+        
+        Args:
+            summaries: Пары (название модели, текст суммаризации)
+            source_stats: Статистика исходного текста
+            
+        Returns:
+            List[Dict]: Результаты анализа в порядке входных пар
+        """
+        score = self.make_scorer(source_stats)
+        return [score(model_name, summary) for model_name, summary in summaries]
     
     def generate_comparison_report(self, analyses: List[Dict]) -> str:
         """
@@ -224,32 +453,27 @@ def main():
     # Пример анализа для Claude и Groq
     source_stats = {'word_count': 4200}
     
-    analyses = []
+    summaries = []
     
     # Анализ Claude 3.5 Sonnet - используем правильный файл
     claude_summary_path = os.path.join(results_dir, "new_claude_summary.md")
     if os.path.exists(claude_summary_path):
-        with open(claude_summary_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            # Извлекаем только текст суммаризации (после "**Суммаризация:**")
-            if "**Суммаризация:**" in content:
-                parts = content.split("**Суммаризация:**")[1]
-                claude_summary = parts.split("**Статистика:**")[0].strip()
-            else:
-                claude_summary = content
-        analyses.append(
-            analyzer.analyze_model("Claude 3.5 Sonnet", claude_summary, source_stats)
+        # Извлекаем только текст суммаризации (после "**Суммаризация:**")
+        claude_summary = _read_section(
+            claude_summary_path, "**Суммаризация:**", "**Статистика:**"
         )
+        summaries.append(("Claude 3.5 Sonnet", claude_summary))
     
     # Анализ Groq Llama3-8B - используем правильный JSON файл
     groq_json_path = os.path.join(results_dir, "groq_new_result.json")
     if os.path.exists(groq_json_path):
-        with open(groq_json_path, 'r', encoding='utf-8') as f:
-            groq_data = json.load(f)
-            groq_summary = groq_data.get("summary", "")
-        analyses.append(
-            analyzer.analyze_model("Groq Llama3-8B", groq_summary, source_stats)
-        )
+        with open(groq_json_path, 'rb') as f:
+            raw = f.read()
+        groq_data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        groq_summary = groq_data.get("summary", "")
+        summaries.append(("Groq Llama3-8B", groq_summary))
+    
+    analyses = analyzer.analyze_batch(summaries, source_stats)
     
     # Генерация отчета
     if analyses:
@@ -4,10 +4,18 @@
 Проверяет все основные компоненты и генерирует отчеты.
 """
 
+import io
 import os
 import sys
+import json
 import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stderr, redirect_stdout
+from functools import partial
 from pathlib import Path
+from typing import Callable, Dict, List, Set, Tuple
 
 
 def print_section(title: str):
@@ -59,9 +67,29 @@ def check_file_structure():
         "reports/FINAL_STRUCTURED_REPORT.md"
     ]
     
+    # Читаем каждый каталог один раз вместо отдельного stat на каждый файл
+    required_by_dir: Dict[str, Set[str]] = {}
+    for file_path in required_files:
+        directory, name = os.path.split(file_path)
+        required_by_dir.setdefault(directory, set()).add(name)
+    
+    present_files = set()
+    for directory, names in required_by_dir.items():
+        try:
+            with os.scandir(directory or ".") as entries:
+                present_names = {entry.name for entry in entries}
+        except OSError:
+            present_names = {
+                name for name in names if os.path.exists(os.path.join(directory, name))
+            }
+        present_files.update(
+            os.path.join(directory, name) if directory else name
+            for name in names & present_names
+        )
+    
     missing_files = []
     for file_path in required_files:
-        if os.path.exists(file_path):
+        if os.path.normpath(file_path) in present_files:
             print(f"[OK] {file_path}")
         else:
             print(f"[MISSING] {file_path}")
@@ -93,6 +121,24 @@ def test_analyzer():
         coherence = analyzer.calculate_coherence(test_text)
         print(f"[OK] Coherence calculation: {coherence}")
         
+        # Большой набор (от 32 строк) проверяется автоматом Ахо-Корасик, если
+        # установлен pyahocorasick; результат должен совпадать с проверкой `in`,
+        # в том числе для пустых, повторяющихся и перекрывающихся строк
+        needles = [f"Item{i}" for i in range(32)] + ["item1", "", "m12 i", "2 item14", "absent"]
+        all_found = needles[:-1]
+        for text in (
+            " ".join(f"item{i}" for i in range(0, 32, 2)),
+            " ".join(f"ITEM{i}" for i in range(32)) + " item12 item14",
+        ):
+            for case in (needles, all_found):
+                expected = sum(1 for n in case if n.lower() in text.lower()) / len(case) * 100
+                actual = analyzer.calculate_coverage(text, case)
+                if actual != expected:
+                    print(f"[ERROR] Coverage mismatch for {len(case)} needles: "
+                          f"{actual} != {expected}")
+                    return False
+        print("[OK] Coverage for large needle sets matches substring checks")
+        
         return True
         
     except Exception as e:
@@ -133,6 +179,94 @@ def test_report_generator():
         return False
 
 
+def test_report_stats_cache():
+    """Тестирует кэш статистики отчетов view_report между запусками."""
+    print_section("TESTING REPORT STATS CACHE")
+    
+    try:
+        import view_report
+        
+        # Вызов без lru_cache, чтобы каждый раз обращаться к файлу кэша
+        stats_for_path = view_report._stats_for_path.__wrapped__
+        saved_path, saved_size = view_report.STATS_CACHE_PATH, view_report.STATS_CACHE_SIZE
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_path = os.path.join(tmp_dir, "cache", "stats.json")
+            view_report.STATS_CACHE_PATH = cache_path
+            
+            reports = {}
+            for name, text in (("a", "a b\nc\n"), ("b", "d\n"), ("c", "e f\n")):
+                reports[name] = os.path.join(tmp_dir, f"{name}.md")
+                with open(reports[name], 'w', encoding='utf-8') as f:
+                    f.write(text)
+            
+            def read_cache():
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            
+            def write_cache(content):
+                with open(cache_path, 'w', encoding='utf-8') as f:
+                    f.write(content if isinstance(content, str) else json.dumps(content))
+            
+            def check(condition, message):
+                if not condition:
+                    raise AssertionError(message)
+            
+            try:
+                # Промах: статистика считается и сохраняется с версией
+                expected = (2, 3, 6)
+                check(stats_for_path(reports["a"], 0) == expected, "miss returned wrong stats")
+                cache = read_cache()
+                check(cache.get("version") == view_report.STATS_CACHE_VERSION,
+                      "cache saved without current version")
+                (digest,) = cache["stats"]
+                print("[OK] Cache miss computes and stores stats")
+                
+                # Попадание: значения берутся из файла кэша
+                write_cache({"version": view_report.STATS_CACHE_VERSION,
+                             "stats": {digest: [7, 8, 9]}})
+                check(stats_for_path(reports["a"], 0) == (7, 8, 9), "cache hit was ignored")
+                print("[OK] Cache hit returns stored stats")
+                
+                # Некорректная запись, другая версия и поврежденный файл пересчитываются
+                for content in (
+                    {"version": view_report.STATS_CACHE_VERSION, "stats": {digest: ["7", 8, 9]}},
+                    {"version": view_report.STATS_CACHE_VERSION - 1,
+                     "stats": {digest: [7, 8, 9]}},
+                    "{bad"
+                ):
+                    write_cache(content)
+                    check(stats_for_path(reports["a"], 0) == expected,
+                          f"stale cache was used: {content!r}")
+                    check(read_cache()["stats"] == {digest: list(expected)},
+                          "cache was not rewritten")
+                print("[OK] Invalid entries, version mismatch and corrupt file are recounted")
+                
+                # Вытесняется давно не использованная запись, а не первая добавленная
+                view_report.STATS_CACHE_SIZE = 2
+                write_cache("")
+                stats_for_path(reports["a"], 0)
+                stats_for_path(reports["b"], 0)
+                digest_a, digest_b = read_cache()["stats"]
+                stats_for_path(reports["a"], 0)
+                stats_for_path(reports["c"], 0)
+                cached = list(read_cache()["stats"])
+                check(digest_a in cached and digest_b not in cached,
+                      "least recently used entry was not evicted")
+                check(os.listdir(os.path.dirname(cache_path)) == ["stats.json"],
+                      "temporary cache files left behind")
+                print("[OK] Least recently used entry is evicted")
+            finally:
+                view_report.STATS_CACHE_PATH = saved_path
+                view_report.STATS_CACHE_SIZE = saved_size
+        
+        return True
+        
+    except Exception as e:
+        print(f"[ERROR] Stats cache test failed: {str(e)}")
+        return False
+
+
 def test_groq_script():
     """Тестирует скрипт Groq (если API ключ доступен)."""
     print_section("TESTING GROQ SCRIPT")
@@ -188,20 +322,23 @@ def check_code_quality():
     
     for file_path in python_files:
         if os.path.exists(file_path):
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
-            # Базовые проверки PEP8
-            lines = content.split('\n')
-            
-            # Проверка docstring
+            # Базовые проверки PEP8 за один проход по файлу
             has_docstring = False
+            long_lines = 0
             
-            # Ищем docstring в первых нескольких строках (после shebang)
-            for line in lines[:5]:
-                if line.strip().startswith('"""') or line.strip().startswith("'''"):
-                    has_docstring = True
-                    break
+            with open(file_path, 'r', encoding='utf-8') as f:
+                for idx, line in enumerate(f):
+                    line = line.rstrip('\n')
+                    
+                    # Ищем docstring в первых нескольких строках (после shebang)
+                    if idx < 5 and not has_docstring:
+                        stripped = line.strip()
+                        if stripped.startswith('"""') or stripped.startswith("'''"):
+                            has_docstring = True
+                    
+                    # Проверка длинных строк
+                    if len(line) > 100:
+                        long_lines += 1
             
             if not has_docstring:
                 print(f"[WARNING] {file_path}: Missing module docstring")
@@ -209,10 +346,8 @@ def check_code_quality():
             else:
                 print(f"[OK] {file_path}: Has module docstring")
             
-            # Проверка длинных строк
-            long_lines = [i+1 for i, line in enumerate(lines) if len(line) > 100]
             if long_lines:
-                print(f"[WARNING] {file_path}: Lines too long: {len(long_lines)} lines")
+                print(f"[WARNING] {file_path}: Lines too long: {long_lines} lines")
                 issues += 1
             else:
                 print(f"[OK] {file_path}: Line length OK")
@@ -225,24 +360,39 @@ def check_code_quality():
     return issues == 0
 
 
-def generate_final_report():
-    """Генерирует финальный отчет."""
+def generate_final_report(isolated: bool = False):
+    """
+    Генерирует финальный отчет.
+    
+    По умолчанию generate_report.main() вызывается в текущем процессе,
+    что избавляет от запуска нового интерпретатора. С isolated=True
+    скрипт запускается в отдельном процессе, как в CI.
+    """
     print_section("GENERATING FINAL REPORT")
     
     try:
-        result = subprocess.run(
-            [sys.executable, "generate_report.py"],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
+        if isolated:
+            result = subprocess.run(
+                [sys.executable, "generate_report.py"],
+                capture_output=True,
+                text=True,
+                timeout=30
+            )
+            returncode, stdout, stderr = result.returncode, result.stdout, result.stderr
+        else:
+            import generate_report
+            
+            stdout_buffer, stderr_buffer = io.StringIO(), io.StringIO()
+            with redirect_stdout(stdout_buffer), redirect_stderr(stderr_buffer):
+                returncode = generate_report.main()
+            stdout, stderr = stdout_buffer.getvalue(), stderr_buffer.getvalue()
         
-        if result.returncode == 0:
+        if returncode == 0:
             print("[OK] Report generated successfully")
-            print(result.stdout)
+            print(stdout)
             return True
         else:
-            print(f"[ERROR] Report generation failed: {result.stderr}")
+            print(f"[ERROR] Report generation failed: {stderr}")
             return False
             
     except Exception as e:
@@ -250,33 +400,101 @@ def generate_final_report():
         return False
 
 
-def main():
-    """Главная функция тестирования."""
+class _ThreadOutput(io.TextIOBase):
+    """Поток вывода, направляющий print каждого потока в свой буфер."""
+    
+    def __init__(self, stream):
+        """Инициализация с исходным потоком для потоков без буфера."""
+        self._stream = stream
+        self._local = threading.local()
+    
+    def capture(self) -> io.StringIO:
+        """Начинает сбор вывода текущего потока в отдельный буфер."""
+        self._local.buffer = io.StringIO()
+        return self._local.buffer
+    
+    def write(self, text: str) -> int:
+        """Пишет в буфер текущего потока или в исходный поток."""
+        buffer = getattr(self._local, 'buffer', None)
+        return (self._stream if buffer is None else buffer).write(text)
+    
+    def flush(self):
+        """Сбрасывает исходный поток."""
+        self._stream.flush()
+
+
+def run_test(test_name: str, test_func) -> bool:
+    """Запускает один тест и печатает его итог."""
+    print(f"\n>>> Running {test_name} test...")
+    try:
+        if test_func():
+            print(f"[PASS] {test_name}")
+            return True
+        print(f"[FAIL] {test_name}")
+    except Exception as e:
+        print(f"[ERROR] {test_name}: {str(e)}")
+    return False
+
+
+def run_parallel(tests: List[Tuple[str, Callable[[], bool]]]) -> int:
+    """
+    Запускает независимые тесты параллельно в пуле потоков.
+    
+    Вывод каждого теста собирается в отдельный буфер и печатается
+    целиком в исходном порядке тестов, поэтому лог совпадает с
+    последовательным запуском.
+    
+    Returns:
+        int: Количество пройденных тестов
+    """
+    output = _ThreadOutput(sys.stdout)
+    
+    def worker(test_name, test_func):
+        buffer = output.capture()
+        return run_test(test_name, test_func), buffer.getvalue()
+    
+    passed = 0
+    original_stdout, sys.stdout = sys.stdout, output
+    try:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(worker, *test) for test in tests]
+            for future in futures:
+                ok, text = future.result()
+                original_stdout.write(text)
+                passed += ok
+    finally:
+        sys.stdout = original_stdout
+    
+    return passed
+
+
+def main(isolated: bool = False):
+    """
+    Главная функция тестирования.
+    
+    Args:
+        isolated: Запускать генератор отчета в отдельном процессе
+    """
     print_section("LLM TEXT SUMMARIZATION ANALYSIS - FULL TEST")
     
-    tests = [
-        ("Dependencies", check_dependencies),
+    # Независимые проверки файлов и модулей выполняются параллельно,
+    # запуск внешних скриптов остается последовательным
+    parallel_tests = [
         ("File Structure", check_file_structure),
         ("LLM Analyzer", test_analyzer),
         ("Report Generator", test_report_generator),
-        ("Code Quality", check_code_quality),
+        ("Stats Cache", test_report_stats_cache),
+        ("Code Quality", check_code_quality)
+    ]
+    sequential_tests = [
         ("Groq Script", test_groq_script),
-        ("Final Report", generate_final_report)
+        ("Final Report", partial(generate_final_report, isolated))
     ]
     
-    passed = 0
-    total = len(tests)
-    
-    for test_name, test_func in tests:
-        print(f"\n>>> Running {test_name} test...")
-        try:
-            if test_func():
-                passed += 1
-                print(f"[PASS] {test_name}")
-            else:
-                print(f"[FAIL] {test_name}")
-        except Exception as e:
-            print(f"[ERROR] {test_name}: {str(e)}")
+    passed = int(run_test("Dependencies", check_dependencies))
+    passed += run_parallel(parallel_tests)
+    passed += sum(run_test(test_name, test_func) for test_name, test_func in sequential_tests)
+    total = 1 + len(parallel_tests) + len(sequential_tests)
     
     print_section("TEST RESULTS")
     print(f"Passed: {passed}/{total}")
@@ -291,4 +509,4 @@ def main():
 
 
 if __name__ == "__main__":
-    exit(main()) 
\ No newline at end of file
+    exit(main(isolated="--isolated" in sys.argv[1:])) 
\ No newline at end of file
@@ -4,8 +4,106 @@
 Показывает количество строк, слов и символов в файле отчета.
 """
 
+import hashlib
+import json
 import os
 import sys
+import tempfile
+from functools import lru_cache
+from typing import Dict, Tuple
+
+# Кэш статистики между запусками: SHA-256 содержимого -> [строки, слова, символы]
+STATS_CACHE_PATH = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "case01",
+    "stats.json"
+)
+STATS_CACHE_SIZE = 32
+# Меняется при любом изменении способа подсчета: кэш другой версии сбрасывается
+STATS_CACHE_VERSION = 2
+
+
+def _load_stats_cache() -> Dict[str, list]:
+    """
+    Загружает кэш статистики.
+    
+    Поврежденный, отсутствующий или записанный другой версией подсчета
+    кэш считается пустым.
+    """
+    try:
+        with open(STATS_CACHE_PATH, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("version") != STATS_CACHE_VERSION:
+        return {}
+    stats = cache.get("stats")
+    return stats if isinstance(stats, dict) else {}
+
+
+def _save_stats_cache(cache: Dict[str, list]):
+    """
+    Сохраняет кэш статистики, оставляя STATS_CACHE_SIZE последних записей.
+    
+    Записи упорядочены от давно использованных к недавним. Файл пишется
+    во временный файл с уникальным именем и атомарно заменяет кэш, поэтому
+    одновременные запуски не портят друг другу данные.
+    """
+    entries = list(cache.items())[-STATS_CACHE_SIZE:]
+    cache_dir = os.path.dirname(STATS_CACHE_PATH)
+    tmp_path = None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=cache_dir,
+                                         prefix='stats.', suffix='.tmp',
+                                         delete=False) as f:
+            tmp_path = f.name
+            json.dump({"version": STATS_CACHE_VERSION, "stats": dict(entries)}, f)
+        os.replace(tmp_path, STATS_CACHE_PATH)
+    except OSError:
+        # Кэш необязателен, статистика уже посчитана
+        if tmp_path is not None:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+@lru_cache(maxsize=32)
+def _stats_for_path(path: str, mtime_ns: int) -> Tuple[int, int, int]:
+    """
+    Подсчитывает строки, слова и символы в файле.
+    
+    Результат кэшируется по пути и времени изменения файла, поэтому
+    повторные вызовы для неизменившегося отчета не перечитывают его.
+    Между запусками статистика хранится в STATS_CACHE_PATH по хешу
+    содержимого, и для уже встречавшегося отчета подсчет пропускается.
+    Подсчет ведется по декодированному тексту: bytes.split() и подсчет
+    b'\n' расходятся с str.split() и splitlines() на неразрывных пробелах
+    и разделителях строк Unicode, а декодирование все равно нужно для
+    подсчета символов.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    
+    digest = hashlib.sha256(data).hexdigest()
+    cache = _load_stats_cache()
+    cached = cache.get(digest)
+    if (isinstance(cached, list) and len(cached) == 3
+            and all(type(value) is int for value in cached)):
+        # Переносим запись в конец, чтобы вытеснялись давно не использованные
+        if list(cache)[-1] != digest:
+            cache[digest] = cache.pop(digest)
+            _save_stats_cache(cache)
+        return tuple(cached)
+    
+    # Переводы строк как при чтении в текстовом режиме
+    content = data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+    stats = (len(content.splitlines()), len(content.split()), len(content))
+    cache[digest] = list(stats)
+    _save_stats_cache(cache)
+    return stats
+
 
 def display_report_stats():
     """Показывает статистику по финальному отчету."""
@@ -19,12 +117,9 @@ def display_report_stats():
     print("-" * 60)
     
     try:
-        with open(report_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            
-        lines = len(content.splitlines())
-        words = len(content.split())
-        chars = len(content)
+        lines, words, chars = _stats_for_path(
+            report_path, os.stat(report_path).st_mtime_ns
+        )
         
         print(f"  Lines: {lines}")
         print(f"  Words: {words}")